@@ -2,79 +2,223 @@
 
 import os
 import subprocess
+import selectors
+import shutil
 import sys
 import wx
 import datetime
+import array
+import collections
+import functools
+import itertools
 import json
 import logging
 import threading
+import multiprocessing
 import zipfile
 import tarfile
 import zlib
-import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+try:
+    import deflate  # libdeflate bindings, used for faster tar.gz output when installed
+except ImportError:
+    deflate = None
+
+try:
+    import pypdfium2 as pdfium  # in-process text extraction, avoids one pdftotext launch per file
+except ImportError:
+    pdfium = None
+
+try:
+    import pikepdf  # libqpdf bindings, linearizes without one qpdf launch per file
+except ImportError:
+    pikepdf = None
 
 # Configure logging
 log_file = "pdf_converter.log"
 logging.basicConfig(filename=log_file, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+config_file = "config.json"
+
+# Number of PDFs processed concurrently; leave one core for the GUI
+WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# Pools are started from a worker thread of a running wx app; forking that process
+# is unsafe, so pool processes are spawned fresh instead
+_mp_context = multiprocessing.get_context("spawn")
+
+# Every capitalisation of ".pdf", so file names can be matched with a single endswith()
+_PDF_SUFFIXES = tuple("." + "".join(chars) for chars in itertools.product("pP", "dD", "fF"))
+
+# Read/write buffer size for archive members
+COPY_BUFSIZE = 1 << 20
+
+# libdeflate gzips the whole tar in one call, so it is only used for folders up to this size
+DEFLATE_MAX_SIZE = 256 << 20
+
+# Subprocess output is posted to the GUI in batches of about this size
+OUTPUT_FLUSH_SIZE = 16 * 1024
+
+# Already-compressed formats are stored as-is in zip archives
+STORED_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".gz", ".zip", ".7z"}
+
+@functools.lru_cache(maxsize=None)
 def check_program_exists(program):
+    # PATH/file lookup only; no need to launch the program to see if it's there
+    path = program if os.path.isabs(program) else shutil.which(program)
+    return path is not None and os.path.isfile(path) and os.access(path, os.X_OK)
+
+# Scanned PDFs as parallel sequences: full paths, paths relative to the
+# scanned directory, and file sizes (array('q'))
+PdfBatch = collections.namedtuple("PdfBatch", ["paths", "relpaths", "sizes"])
+
+def _scan_folder(folder_path):
+    size = 0
+    subdirs = []
+    pdf_paths = []
+    pdf_sizes = []
+    add_path = pdf_paths.append
+    add_size = pdf_sizes.append
     try:
-        if program == "/usr/bin/qpdf":
-            subprocess.run([program, "--help"], capture_output=True, check=True, text=True)
-            return True
-        else:
-            subprocess.run([program, "-v"], capture_output=True, check=True, text=True)
-            return True
-    except FileNotFoundError:
-        return False
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error checking '{program}': {e.stderr}")
-        wx.MessageBox(f"Error checking '{program}': {e.stderr}", "Error", wx.OK | wx.ICON_ERROR)
-        return False
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                # symbolic links are listed but don't count towards the size
+                file_size = 0 if entry.is_symlink() else entry.stat(follow_symlinks=False).st_size
+                size += file_size
+                if entry.name.endswith(_PDF_SUFFIXES):
+                    add_path(entry.path)
+                    add_size(file_size)
+    except OSError as e:
+        logging.warning(f"Skipping '{folder_path}': {e}")
+    return size, subdirs, pdf_paths, pdf_sizes
+
+# Walk directory once, returning (PdfBatch, total size of all files)
+def scan_tree(directory):
+    paths = []
+    sizes = array.array("q")
+    total_size = 0
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pending = {executor.submit(_scan_folder, directory)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                size, subdirs, pdf_paths, pdf_sizes = future.result()
+                total_size += size
+                paths.extend(pdf_paths)
+                sizes.extend(pdf_sizes)
+                pending.update(executor.submit(_scan_folder, d) for d in subdirs)
+    # Every path starts with directory + separator, so slicing gives the relative path
+    prefix_len = len(os.path.join(directory, ""))
+    relpaths = [path[prefix_len:] for path in paths]
+    return PdfBatch(paths, relpaths, sizes), total_size
 
 def find_pdfs_recursive(directory):
-    pdf_files = []
-    for root, _, files in os.walk(directory):
+    return scan_tree(directory)[0].paths
+
+def _walk_files(folder_path):
+    # Yields (path, path relative to folder_path) for every file in the tree
+    prefix_len = len(os.path.join(folder_path, ""))
+    join = os.path.join
+    for root, _, files in os.walk(folder_path):
         for file in files:
-            if file.lower().endswith((".pdf", ".PDF")):
-                pdf_files.append(os.path.join(root, file))
-    return pdf_files
+            full = join(root, file)
+            yield full, full[prefix_len:]
 
-def convert_pdfs_to_text(pdf_dir, output_dir, pdftotext_path, output_text):
+def _contains_path(parent, child):
+    # True if child is parent itself or lies somewhere below it
+    parent = os.path.realpath(parent)
+    child = os.path.realpath(child)
     try:
-        pdf_files = find_pdfs_recursive(pdf_dir)
-        if not pdf_files:
-            wx.MessageBox("No PDF files found in the specified directory or its subdirectories.", "Info", wx.OK | wx.ICON_INFORMATION)
+        return os.path.commonpath([parent, child]) == parent
+    except ValueError:  # different drives
+        return False
+
+def _output_path(relative_path, output_dir, extension):
+    output_path = os.path.join(output_dir, relative_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_path[:-4] + extension
+
+def _extract_text(job):
+    # Runs in a multiprocessing worker; errors are returned, not raised
+    pdf_file, txt_path = job
+    try:
+        doc = pdfium.PdfDocument(pdf_file)
+        try:
+            # PDFium separates lines with \r\n; write \n like pdftotext does
+            text = "\n".join(page.get_textpage().get_text_range().replace("\r\n", "\n") for page in doc)
+        finally:
+            doc.close()
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return pdf_file, None
+    except Exception as e:
+        return pdf_file, str(e)
+
+def _linearize_pdf(job):
+    # Runs in a multiprocessing worker; errors are returned, not raised
+    pdf_file, out_path = job
+    try:
+        with pikepdf.open(pdf_file) as pdf:
+            pdf.save(out_path, linearize=True)
+        return pdf_file, None
+    except Exception as e:
+        return pdf_file, str(e)
+
+def _convert_one(pdf_file, relative_path, output_dir, pdftotext_path):
+    txt_path = _output_path(relative_path, output_dir, ".txt")
+
+    process = subprocess.Popen(
+        [pdftotext_path, "-layout", "-nopgbrk", "-enc", "UTF-8", pdf_file, txt_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return process.communicate()
+
+def convert_pdfs_to_text(pdf_dir, output_dir, pdftotext_path, append_output, pdf_files=None, use_pdfium=False):
+    try:
+        if pdf_files is None:
+            pdf_files = scan_tree(pdf_dir)[0]
+        if not pdf_files.paths:
+            wx.CallAfter(wx.MessageBox, "No PDF files found in the specified directory or its subdirectories.", "Info", wx.OK | wx.ICON_INFORMATION)
             return
 
-        total_files = len(pdf_files)
-        for i, pdf_file in enumerate(pdf_files):
-            relative_path = os.path.relpath(pdf_file, pdf_dir)
-            output_path = os.path.join(output_dir, relative_path)
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            txt_path = os.path.join(output_path[:-4] + ".txt")
+        # PDFium is used when asked for, or when the configured pdftotext can't be found
+        if pdfium is not None and (use_pdfium or not check_program_exists(pdftotext_path)):
+            jobs = [(pdf_file, _output_path(relative_path, output_dir, ".txt"))
+                    for pdf_file, relative_path in zip(pdf_files.paths, pdf_files.relpaths)]
+            with _mp_context.Pool(WORKERS) as pool:
+                for pdf_file, error in pool.imap_unordered(_extract_text, jobs, chunksize=4):
+                    if error:
+                        logging.error(f"Error converting PDF '{pdf_file}': {error}")
+                        append_output(f"\n[Error]: {pdf_file}: {error}")
+            return
 
-            try:
-                process = subprocess.Popen(
-                    [pdftotext_path, "-layout", "-nopgbrk", "-enc", "UTF-8", pdf_file, txt_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-                stdout, stderr = process.communicate()
-                wx.CallAfter(output_text.AppendText, stdout)
-                if stderr:
-                    wx.CallAfter(output_text.AppendText, f"\n[Error]: {stderr.strip()}")
-
-            except FileNotFoundError:
-                wx.MessageBox(f"Error: Input PDF file '{pdf_file}' not found!", "Error", wx.OK | wx.ICON_ERROR)
-            except subprocess.CalledProcessError as e:
-                wx.MessageBox(f"Error converting PDF '{pdf_file}': {e.stderr}", "Error", wx.OK | wx.ICON_ERROR)
-            except Exception as e:
-                wx.MessageBox(f"An unexpected error occurred during conversion of '{pdf_file}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            futures = {executor.submit(_convert_one, pdf_file, relative_path, output_dir, pdftotext_path): pdf_file
+                       for pdf_file, relative_path in zip(pdf_files.paths, pdf_files.relpaths)}
+            for future in as_completed(futures):
+                pdf_file = futures[future]
+                try:
+                    stdout, stderr = future.result()
+                    append_output(stdout)
+                    if stderr:
+                        append_output(f"\n[Error]: {stderr.strip()}")
+
+                except FileNotFoundError:
+                    wx.CallAfter(wx.MessageBox, f"Error: Input PDF file '{pdf_file}' not found!", "Error", wx.OK | wx.ICON_ERROR)
+                except subprocess.CalledProcessError as e:
+                    wx.CallAfter(wx.MessageBox, f"Error converting PDF '{pdf_file}': {e.stderr}", "Error", wx.OK | wx.ICON_ERROR)
+                except Exception as e:
+                    wx.CallAfter(wx.MessageBox, f"An unexpected error occurred during conversion of '{pdf_file}': {e}", "Error", wx.OK | wx.ICON_ERROR)
 
     except Exception as e:
-        wx.MessageBox(f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
+        wx.CallAfter(wx.MessageBox, f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
 
 def compress_pdf(pdf_path, compressed_path, quality="ebook", gs_path="/usr/bin/gs", gs_flags=None):
@@ -114,14 +258,7 @@ def decompress_pdf(pdf_path, decompressed_path, qpdf_path="/usr/bin/qpdf"):
         return False
 
 def get_folder_size(folder_path):
-    total_size = 0
-    for dirpath, _, filenames in os.walk(folder_path):
-        for f in filenames:
-            fp = os.path.join(dirpath, f)
-            # skip if it is symbolic link
-            if not os.path.islink(fp):
-                total_size += os.path.getsize(fp)
-    return total_size
+    return scan_tree(folder_path)[1]
 
 def format_bytes(size):
     power = 2**10
@@ -132,30 +269,82 @@ def format_bytes(size):
         n += 1
     return f"{size:.2f} {units[n]}B"
 
+def _deflate_gzip(data, level=6):
+    return deflate.gzip_compress(data, level)
+
 def compress_folder(folder_path, output_filename, compression_type="zip"):
     try:
         if compression_type == "zip":
-            with zipfile.ZipFile(output_filename, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                for root, _, files in os.walk(folder_path):
-                    for file in files:
-                        zf.write(os.path.join(root, file), arcname=os.path.relpath(os.path.join(root, file), folder_path))
+            members = [arcname for _, arcname in _walk_files(folder_path)]
+            # zip refuses to write an empty archive; the zipfile fallback below handles that case
+            if shutil.which("zip") and members:
+                # zip adds to an existing archive, so start from scratch
+                if os.path.exists(output_filename):
+                    os.remove(output_filename)
+                # Pass the file list on stdin (-@) instead of -r so symlinked directories
+                # aren't followed, matching os.walk and the tar path
+                # -n matches suffixes case-sensitively on Unix, so list every capitalisation
+                # to store the same files as the lowercased check in the zipfile fallback
+                stored = sorted("".join(chars) for ext in STORED_EXTENSIONS
+                                for chars in itertools.product(*({c.lower(), c.upper()} for c in ext)))
+                subprocess.run(["zip", "-q", "-1", "-n", ":".join(stored),
+                                os.path.abspath(output_filename), "-@"],
+                               cwd=folder_path, input=b"\n".join(os.fsencode(m) for m in members), check=True)
+            else:
+                # Level 1: the archive is for packaging, not maximum ratio
+                with zipfile.ZipFile(output_filename, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=True) as zf:
+                    for full, arcname in _walk_files(folder_path):
+                        zinfo = zipfile.ZipInfo.from_file(full, arcname=arcname)
+                        # ZipFile.open() ignores the archive's level for ZipInfo args, mirror ZipFile.write()
+                        if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+                            zinfo.compress_type = zipfile.ZIP_STORED
+                        else:
+                            zinfo.compress_type = zipfile.ZIP_DEFLATED
+                        # _compresslevel is private; 3.13+ names it compress_level and keeps this as an alias
+                        zinfo._compresslevel = zf.compresslevel
+                        # from_file() sets file_size, so zipfile decides on zip64 per entry by itself
+                        with open(full, "rb", buffering=COPY_BUFSIZE) as src, \
+                                zf.open(zinfo, "w") as dst:
+                            shutil.copyfileobj(src, dst, length=COPY_BUFSIZE)
         elif compression_type == "7z":
             # 7z compression requires an external command.
             # This example uses a 7z command; adjust based on your 7z installation.
-            command = ["7z", "a", "-t7z", output_filename, folder_path]
+            command = ["7z", "a", "-t7z", "-mmt=on", output_filename, folder_path]
             subprocess.run(command, check=True)
 
         elif compression_type == "tar.gz":
-            with tarfile.open(output_filename, "w:gz") as tar:
-                for root, _, files in os.walk(folder_path):
-                    for file in files:
-                        tar.add(os.path.join(root, file), arcname=os.path.relpath(os.path.join(root, file), folder_path))
+            if shutil.which("tar"):
+                if shutil.which("pigz"):
+                    command = ["tar", f"--use-compress-program=pigz -p {os.cpu_count() or 1}", "-cf", output_filename]
+                else:
+                    command = ["tar", "-czf", output_filename]
+                # Pass the file list so members are named like the tarfile fallbacks
+                # ("a.pdf", "sub/x.pdf"), without "./" prefixes or directory entries
+                command += ["-C", folder_path, "--null", "-T", "-"]
+                members = b"\0".join(os.fsencode(arcname) for _, arcname in _walk_files(folder_path))
+                subprocess.run(command, input=members, check=True)
+            elif deflate is not None and get_folder_size(folder_path) <= DEFLATE_MAX_SIZE:
+                # Build the tar uncompressed on disk, then gzip it in one libdeflate call
+                with tempfile.TemporaryFile() as tmp:
+                    with tarfile.open(fileobj=tmp, mode="w", copybufsize=COPY_BUFSIZE) as tar:
+                        for full, arcname in _walk_files(folder_path):
+                            tar.add(full, arcname=arcname)
+                    tmp.seek(0)
+                    data = _deflate_gzip(tmp.read(), 1)
+                with open(output_filename, "wb") as f:
+                    f.write(data)
+            else:
+                # tarfile copies members in 16 KB pieces by default; use 1 MB reads and writes
+                with open(output_filename, "wb", buffering=COPY_BUFSIZE) as f, \
+                        tarfile.open(fileobj=f, mode="w:gz", compresslevel=1, copybufsize=COPY_BUFSIZE) as tar:
+                    for full, arcname in _walk_files(folder_path):
+                        tar.add(full, arcname=arcname)
         else:
             raise ValueError(f"Unsupported compression type: {compression_type}")
         return True
     except (FileNotFoundError, subprocess.CalledProcessError, ValueError, OSError) as e:
         logging.error(f"Error compressing folder '{folder_path}': {e}")
-        wx.MessageBox(f"Error compressing folder: {e}", "Error", wx.OK | wx.ICON_ERROR)
+        wx.CallAfter(wx.MessageBox, f"Error compressing folder: {e}", "Error", wx.OK | wx.ICON_ERROR)
         return False
 
 class PDFConverterGUI(wx.Frame):
@@ -163,7 +352,7 @@ class PDFConverterGUI(wx.Frame):
         super(PDFConverterGUI, self).__init__(parent, title=title, size=(600, 650), style=wx.DEFAULT_FRAME_STYLE & ~wx.RESIZE_BORDER)
 
         # Check for required programs
-        if not check_program_exists("pdftotext"):
+        if pdfium is None and not check_program_exists("pdftotext"):
             wx.MessageBox("Error: pdftotext not found. Please install poppler-utils.", "Error", wx.OK | wx.ICON_ERROR)
             self.Close()
             return
@@ -173,7 +362,7 @@ class PDFConverterGUI(wx.Frame):
             self.Close()
             return
 
-        if not check_program_exists("/usr/bin/qpdf"):
+        if pikepdf is None and not check_program_exists("/usr/bin/qpdf"):
             wx.MessageBox("Error: qpdf not found. Please install qpdf.", "Error", wx.OK | wx.ICON_ERROR)
             self.Close()
             return
@@ -184,7 +373,18 @@ class PDFConverterGUI(wx.Frame):
         self.sizer = wx.BoxSizer(wx.VERTICAL)
 
         # Load settings from config file
-        self.settings = self.load_settings("config.json")
+        self.settings = self.load_settings(config_file)
+
+        # Settings are written on close, plus every 5 s if something changed
+        self._settings_dirty = False
+        self._settings_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.write_settings, self._settings_timer)
+        self._settings_timer.Start(5000)
+
+        # Results of the input scan done at the start of each job
+        self._pdf_cache = PdfBatch([], [], array.array("q"))
+        self._input_size = 0
+        self._worker = None
 
         # Color scheme
         self.background_color = wx.Colour(240, 240, 240)
@@ -202,6 +402,11 @@ class PDFConverterGUI(wx.Frame):
         self.output_dir_edit.SetBackgroundColour(self.background_color)
         self.pdftotext_path_edit.SetBackgroundColour(self.background_color)
 
+        self.pdfium_checkbox = wx.CheckBox(self.panel, label="Use PDFium")
+        self.pdfium_checkbox.SetToolTip("Extract text in-process with pypdfium2 instead of pdftotext (faster, no -layout)")
+        self.pdfium_checkbox.SetValue(pdfium is not None and self.settings.get("use_pdfium", False))
+        self.pdfium_checkbox.Enable(pdfium is not None)
+
         # Compress/Decompress Options
         self.action_label = wx.StaticText(self.panel, label="Action:")
         self.action_combo = wx.ComboBox(self.panel, choices=["Convert to Text", "Compress PDF", "Decompress PDF"], style=wx.CB_READONLY)
@@ -259,6 +464,12 @@ class PDFConverterGUI(wx.Frame):
         self.output_text.SetBackgroundColour(wx.Colour(220, 220, 220))
         self.output_text.SetFont(wx.Font(10, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
 
+        # Worker output is buffered and appended to the text control every 50 ms while a job runs
+        self._out_buf = []
+        self._out_lock = threading.Lock()
+        self._out_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self._flush_output, self._out_timer)
+
 
         # Layout
         sizer = wx.GridBagSizer(5, 5)
@@ -270,6 +481,7 @@ class PDFConverterGUI(wx.Frame):
         sizer.Add(self.browse_output_button, pos=(1, 2), flag=wx.ALL, border=5)
         sizer.Add(pdftotext_path_label, pos=(2, 0), flag=wx.ALL, border=5)
         sizer.Add(self.pdftotext_path_edit, pos=(2, 1), flag=wx.EXPAND | wx.ALL, border=5)
+        sizer.Add(self.pdfium_checkbox, pos=(2, 2), flag=wx.ALL, border=5)
         sizer.Add(self.action_label, pos=(3, 0), flag=wx.ALL, border=5)
         sizer.Add(self.action_combo, pos=(3, 1), flag=wx.EXPAND | wx.ALL, border=5)
         sizer.Add(self.quality_group, pos=(4, 0), span=(1, 3), flag=wx.EXPAND | wx.ALL, border=5)
@@ -289,8 +501,18 @@ class PDFConverterGUI(wx.Frame):
         self.Bind(wx.EVT_BUTTON, self.on_browse_output, self.browse_output_button)
         self.Bind(wx.EVT_BUTTON, self.on_convert, self.convert_button)
         self.action_combo.Bind(wx.EVT_COMBOBOX, self.on_action_changed)
+        self.Bind(wx.EVT_CLOSE, self._on_close)
 
-
+    def _on_close(self, event):
+        # Closing mid-job would kill the worker thread and orphan its gs/qpdf processes
+        if self._worker is not None and self._worker.is_alive() and event.CanVeto():
+            event.Veto()
+            wx.MessageBox("A job is still running. Please wait for it to finish before closing.", "Info", wx.OK | wx.ICON_INFORMATION)
+            return
+        self._settings_timer.Stop()
+        self._out_timer.Stop()
+        self.write_settings()
+        event.Skip()
 
     def on_browse_input(self, event):
         with wx.DirDialog(self, "Choose input directory", style=wx.DD_DEFAULT_STYLE | wx.DD_NEW_DIR_BUTTON) as dlg:
@@ -308,10 +530,12 @@ class PDFConverterGUI(wx.Frame):
         pdf_dir = self.input_dir_edit.GetValue()
         output_dir = self.output_dir_edit.GetValue()
         pdftotext_path = self.pdftotext_path_edit.GetValue()
+        use_pdfium = self.pdfium_checkbox.IsChecked()
         action = self.action_combo.GetValue()
+        compression_type = self.compression_type_combo.GetValue()
 
         # Check for existing files in the output directory and prompt the user
-        if self.handle_existing_files(output_dir):
+        if self.handle_existing_files(output_dir, pdf_dir):
             return  # Conversion aborted if the user chooses not to proceed
 
         gs_flags = []
@@ -320,95 +544,164 @@ class PDFConverterGUI(wx.Frame):
         if self.verbose_checkbox.IsChecked():
             gs_flags.append("-v")
 
-        self.Update()
-        self.panel.Refresh()
-
+        # The job runs off the GUI thread; it only touches widgets through wx.CallAfter
+        self.convert_button.Disable()
+        self._out_timer.Start(50)
+        self._worker = threading.Thread(target=self._run_job,
+                                        args=(pdf_dir, output_dir, pdftotext_path, use_pdfium, action, self.selected_quality, gs_flags, compression_type),
+                                        daemon=True)
+        self._worker.start()
+        self.save_setting("compression_quality", self.selected_quality)
+        self.save_setting("use_pdfium", use_pdfium)
 
+    def _run_job(self, pdf_dir, output_dir, pdftotext_path, use_pdfium, action, quality, gs_flags, compression_type):
         try:
+            # Scan the input tree once; the actions and the job summary reuse it
+            self._pdf_cache, self._input_size = scan_tree(pdf_dir)
+
             if action == "Convert to Text":
-                self.convert_text(pdf_dir, output_dir, pdftotext_path)
+                self.convert_text(pdf_dir, output_dir, pdftotext_path, use_pdfium)
             elif action == "Compress PDF":
-                self.compress_pdfs(pdf_dir, output_dir, self.selected_quality, gs_flags)
+                self.compress_pdfs(pdf_dir, output_dir, quality, gs_flags)
             elif action == "Decompress PDF":
                 self.decompress_pdfs(pdf_dir, output_dir)
-            compression_type = self.compression_type_combo.GetValue()
             if compression_type:
                 self.compress_output(output_dir, compression_type)
             self.show_job_summary(pdf_dir, output_dir) #moved job summary to the end
         except Exception as e:
             logging.exception("An unexpected error occurred during conversion.")
-            wx.MessageBox(f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
+        finally:
+            wx.CallAfter(self._finish_job)
 
+    def _finish_job(self):
+        self._out_timer.Stop()
+        self._flush_output()
+        self.convert_button.Enable()
 
-        self.Update()
-        self.panel.Refresh()
-        self.save_setting("compression_quality", self.selected_quality)
+    def append_output(self, text):
+        # Safe to call from any thread
+        with self._out_lock:
+            self._out_buf.append(text)
+
+    def _flush_output(self, event=None):
+        with self._out_lock:
+            buf, self._out_buf = self._out_buf, []
+        if buf:
+            self.output_text.AppendText("".join(buf))
 
-    def convert_text(self, pdf_dir, output_dir, pdftotext_path):
-        convert_pdfs_to_text(pdf_dir, output_dir, pdftotext_path, self.output_text)
+    def convert_text(self, pdf_dir, output_dir, pdftotext_path, use_pdfium=False):
+        convert_pdfs_to_text(pdf_dir, output_dir, pdftotext_path, self.append_output, self._pdf_cache, use_pdfium)
 
 
     def compress_pdfs(self, pdf_dir, output_dir, quality, gs_flags):
         self.run_process(pdf_dir, output_dir, "/usr/bin/gs", "Compress PDF", quality=quality, gs_flags=gs_flags)
 
     def decompress_pdfs(self, pdf_dir, output_dir):
-        self.run_process(pdf_dir, output_dir, "/usr/bin/qpdf", "Decompress PDF")
+        if pikepdf is None:
+            self.run_process(pdf_dir, output_dir, "/usr/bin/qpdf", "Decompress PDF")
+            return
 
-    def run_process(self, pdf_dir, output_dir, program_path, action, quality="ebook", gs_flags=None):
+        # Linearize in-process with libqpdf, one long-lived worker per core
         try:
-            pdf_files = find_pdfs_recursive(pdf_dir)
-            total_files = len(pdf_files)
-            if not total_files:
-                wx.MessageBox("No PDF files found.", "Info", wx.OK | wx.ICON_INFORMATION)
+            pdf_files = self._pdf_cache
+            if not pdf_files.paths:
+                wx.CallAfter(wx.MessageBox, "No PDF files found.", "Info", wx.OK | wx.ICON_INFORMATION)
                 return
 
-            for i, pdf_file in enumerate(pdf_files):
-                try:
-                    process = self.create_process(pdf_file, output_dir, program_path, action, quality, gs_flags)
-                    self.redirect_output(process)
-                    wx.Yield()
+            jobs = [(pdf_file, _output_path(relative_path, output_dir, ".pdf"))
+                    for pdf_file, relative_path in zip(pdf_files.paths, pdf_files.relpaths)]
+            with _mp_context.Pool(WORKERS) as pool:
+                for pdf_file, error in pool.imap_unordered(_linearize_pdf, jobs, chunksize=4):
+                    if error:
+                        logging.error(f"Error processing '{pdf_file}': {error}")
+                        self.append_output(f"[Error]: {pdf_file}: {error}\n")
 
-                except Exception as e:
-                    logging.exception(f"Error processing '{pdf_file}': {e}")
-                    wx.MessageBox(f"Error processing '{pdf_file}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+        except Exception as e:
+            logging.exception("An unexpected error occurred during processing.")
+            wx.CallAfter(wx.MessageBox, f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
+
+    def run_process(self, pdf_dir, output_dir, program_path, action, quality="ebook", gs_flags=None):
+        try:
+            pdf_files = self._pdf_cache
+            if not pdf_files.paths:
+                wx.CallAfter(wx.MessageBox, "No PDF files found.", "Info", wx.OK | wx.ICON_INFORMATION)
+                return
+
+            # Keep up to WORKERS processes running and multiplex their pipes
+            pending = list(zip(reversed(pdf_files.paths), reversed(pdf_files.relpaths)))
+            running = {}
+            with selectors.DefaultSelector() as sel:
+                while pending or running:
+                    while pending and len(running) < WORKERS:
+                        pdf_file, relative_path = pending.pop()
+                        try:
+                            process = self.create_process(pdf_file, relative_path, output_dir, program_path, action, quality, gs_flags)
+                        except Exception as e:
+                            logging.exception(f"Error processing '{pdf_file}': {e}")
+                            wx.CallAfter(wx.MessageBox, f"Error processing '{pdf_file}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+                            continue
+                        running[process] = 2  # open pipes
+                        sel.register(process.stdout, selectors.EVENT_READ, (process, bytearray()))
+                        sel.register(process.stderr, selectors.EVENT_READ, (process, bytearray()))
+
+                    if not running:
+                        continue
+
+                    for key, _ in sel.select():
+                        if self.redirect_output(key):
+                            continue
+                        process = key.data[0]
+                        sel.unregister(key.fileobj)
+                        key.fileobj.close()
+                        running[process] -= 1
+                        if not running[process]:
+                            del running[process]
+                            process.wait()
 
         except Exception as e:
             logging.exception("An unexpected error occurred during processing.")
-            wx.MessageBox(f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"An unexpected error occurred: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
-    def create_process(self, pdf_file, output_dir, program_path, action, quality="ebook", gs_flags=None):
-        relative_path = os.path.relpath(pdf_file, self.input_dir_edit.GetValue())
+    def create_process(self, pdf_file, relative_path, output_dir, program_path, action, quality="ebook", gs_flags=None):
         output_path = os.path.join(output_dir, relative_path)
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         if action == "Convert to Text":
             command = [program_path, "-layout", "-nopgbrk", "-enc", "UTF-8", pdf_file, output_path[:-4] + ".txt"]
         elif action == "Compress PDF":
-            compressed_path = os.path.join(output_path[:-4] + ".pdf")
+            compressed_path = output_path[:-4] + ".pdf"
             command = [program_path, "-sDEVICE=pdfwrite", "-dCompatibilityLevel=1.4",
                        f"-dPDFSETTINGS=/{quality}", "-dNOPAUSE", "-dQUIET", "-dBATCH",
                        "-sOutputFile=" + compressed_path, pdf_file]
             command.extend(gs_flags or [])
         elif action == "Decompress PDF":
-            decompressed_path = os.path.join(output_path[:-4] + ".pdf")
+            decompressed_path = output_path[:-4] + ".pdf"
             command = [program_path, "--linearize", pdf_file, decompressed_path]
         else:
             raise ValueError(f"Unknown action: {action}")
 
-        return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-    def redirect_output(self, process):
-        while True:
-            line = process.stdout.readline()
-            if not line:
-                break
-            wx.CallAfter(self.output_text.AppendText, line)
-
-            error_line = process.stderr.readline()
-            if error_line:
-                wx.CallAfter(self.output_text.AppendText, f"\n[Error]: {error_line.strip()}")
+        return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+
+    def redirect_output(self, key):
+        # Read whatever is ready and post complete lines to the GUI in ~16 KB batches
+        process, buf = key.data
+        data = os.read(key.fd, 1 << 16)
+        if data:
+            buf.extend(data)
+            if len(buf) < OUTPUT_FLUSH_SIZE:
+                return True
+            cut = buf.rfind(b"\n") + 1 or len(buf)
+        else:
+            cut = len(buf)
 
-        process.wait()
+        if cut:
+            text = bytes(buf[:cut]).decode("utf-8", errors="replace")
+            del buf[:cut]
+            if key.fileobj is process.stderr:
+                text = "".join(f"[Error]: {line.strip()}\n" for line in text.splitlines() if line.strip())
+            self.append_output(text)
+        return bool(data)
 
     def on_action_changed(self, event):
         action = self.action_combo.GetValue()
@@ -434,37 +727,62 @@ class PDFConverterGUI(wx.Frame):
 
     def save_setting(self, key, value):
         self.settings[key] = value
-        with open("config.json", "w") as f:
-            json.dump(self.settings, f, indent=4)
-
-    def handle_existing_files(self, output_dir):
-        if os.listdir(output_dir):
-            dlg = wx.MessageDialog(None, "Output directory is not empty. Choose an action:", "Confirm Action", wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION)
-            dlg.SetYesNoLabels("Overwrite", "Delete All")
-            result = dlg.ShowModal()
-            dlg.Destroy()
-            if result == wx.ID_YES:
-                return False  #Overwrite existing files
-            elif result == wx.ID_NO:
-                try:
-                    for filename in os.listdir(output_dir):
-                        file_path = os.path.join(output_dir, filename)
-                        if os.path.isfile(file_path):
-                            os.remove(file_path)
-                    return False
-                except OSError as e:
-                    wx.MessageBox(f"Error deleting files: {e}", "Error", wx.OK | wx.ICON_ERROR)
-                    return True
-            else:
-                return True  # Cancel conversion
-        return False
+        self._settings_dirty = True
+
+    def write_settings(self, event=None):
+        if not self._settings_dirty:
+            return
+        # Write to a temp file and swap it in so a crash never leaves a truncated config
+        tmp_file = config_file + ".tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self.settings, f, indent=4)
+            os.replace(tmp_file, config_file)
+            self._settings_dirty = False
+        except OSError as e:
+            logging.error(f"Error saving settings: {e}")
+
+    def handle_existing_files(self, output_dir, pdf_dir):
+        try:
+            with os.scandir(output_dir) as it:
+                empty = next(it, None) is None
+        except FileNotFoundError:
+            empty = True
+        if empty:
+            return False
+
+        dlg = wx.MessageDialog(None, "Output directory is not empty. Choose an action:", "Confirm Action", wx.YES_NO | wx.CANCEL | wx.ICON_QUESTION)
+        dlg.SetYesNoLabels("Overwrite", "Delete All")
+        result = dlg.ShowModal()
+        dlg.Destroy()
+        if result == wx.ID_YES:
+            return False  #Overwrite existing files
+        elif result == wx.ID_NO:
+            if _contains_path(output_dir, pdf_dir):
+                wx.MessageBox("The output directory contains the input directory; refusing to delete its contents.", "Error", wx.OK | wx.ICON_ERROR)
+                return True
+            try:
+                # Empty the directory but keep it (it may be the working directory)
+                with os.scandir(output_dir) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)
+                        else:
+                            os.unlink(entry.path)
+                return False
+            except OSError as e:
+                wx.MessageBox(f"Error deleting files: {e}", "Error", wx.OK | wx.ICON_ERROR)
+                return True
+        else:
+            return True  # Cancel conversion
 
     def show_job_summary(self, input_dir, output_dir):
         try:
-            num_files = len(find_pdfs_recursive(input_dir))
+            num_files = len(self._pdf_cache.paths)
             num_folders = len([f for f in os.listdir(input_dir) if os.path.isdir(os.path.join(input_dir, f))])
 
-            initial_size = get_folder_size(input_dir)
+            initial_size = self._input_size
+            pdf_size = sum(self._pdf_cache.sizes)  # sizes were collected during the scan, no extra stat calls
             final_size = get_folder_size(output_dir)
 
             summary_text = (f"Job Summary:\n\n"
@@ -473,24 +791,26 @@ class PDFConverterGUI(wx.Frame):
                             f"Number of Files Processed: {num_files}\n"
                             f"Number of Folders: {num_folders}\n"
                             f"Initial Size: {format_bytes(initial_size)}\n"
+                            f"Size of PDFs Processed: {format_bytes(pdf_size)}\n"
                             f"Final Size: {format_bytes(final_size)}")
-            wx.MessageBox(summary_text, "Job Summary", wx.OK | wx.ICON_INFORMATION)
+            wx.CallAfter(wx.MessageBox, summary_text, "Job Summary", wx.OK | wx.ICON_INFORMATION)
         except Exception as e:
             logging.error(f"Error generating job summary: {e}")
-            wx.MessageBox(f"Error generating job summary: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"Error generating job summary: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
     def compress_output(self, output_dir, compression_type):
         try:
             output_filename = os.path.join(os.path.dirname(output_dir), os.path.basename(output_dir) + f".{compression_type}")
             if compress_folder(output_dir, output_filename, compression_type):
-                wx.MessageBox(f"Output folder '{output_dir}' compressed to '{output_filename}'.", "Success", wx.OK | wx.ICON_INFORMATION)
+                wx.CallAfter(wx.MessageBox, f"Output folder '{output_dir}' compressed to '{output_filename}'.", "Success", wx.OK | wx.ICON_INFORMATION)
             else:
-                wx.MessageBox(f"Error compressing output folder.", "Error", wx.OK | wx.ICON_ERROR)
+                wx.CallAfter(wx.MessageBox, f"Error compressing output folder.", "Error", wx.OK | wx.ICON_ERROR)
         except Exception as e:
             logging.exception(f"An unexpected error occurred during output compression: {e}")
-            wx.MessageBox(f"An unexpected error occurred during output compression: {e}", "Error", wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(wx.MessageBox, f"An unexpected error occurred during output compression: {e}", "Error", wx.OK | wx.ICON_ERROR)
 
-app = wx.App()
-frame = PDFConverterGUI(None)
-if frame:
-    app.MainLoop()
+if __name__ == "__main__":
+    app = wx.App()
+    frame = PDFConverterGUI(None)
+    if frame:
+        app.MainLoop()